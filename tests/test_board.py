@@ -71,6 +71,18 @@ class TestBoard:
         
         assert board.is_game_over()
     
+    def test_status(self):
+        """Test combined game-over/winner status."""
+        board = Board(3)
+        assert board.status() == (False, None)
+
+        board.make_move(0, 0, 'X')
+        board.make_move(1, 0, 'O')
+        board.make_move(0, 1, 'X')
+        board.make_move(1, 1, 'O')
+        board.make_move(0, 2, 'X')
+        assert board.status() == (True, 'X')
+
     def test_get_state_vector(self):
         """Test state vector conversion."""
         board = Board(3)
@@ -88,7 +100,15 @@ class TestBoard:
         board.make_move(1, 1, 'O')
         
         state_string = board.get_state_string()
-        assert state_string == "X..O....."
+        assert state_string == "X...O...."
+
+    def test_get_state_bytes(self):
+        """Test state bytes conversion."""
+        board = Board(3)
+        board.make_move(0, 0, 'X')
+        board.make_move(1, 1, 'O')
+
+        assert board.get_state_bytes() == b"X...O...."
     
     def test_copy(self):
         """Test board copying."""
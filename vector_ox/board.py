@@ -1,132 +1,399 @@
 """Board module for Vector-OX game."""
 
+import functools
+
 import numpy as np
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Union
+
+# Player symbols indexed by internal side number (0 = X, 1 = O)
+_PLAYERS = ('X', 'O')
+
+
+@functools.lru_cache(maxsize=None)
+def _cell_indices(size: int) -> np.ndarray:
+    """Row-major cell indices as a uint64 array, for bit extraction."""
+    return np.arange(size * size, dtype=np.uint64)
+
+
+# Largest bit count for which the per-bitboard string LUTs are built
+# (2^16 x 16 bytes per table for a 4x4 board; 3x3 needs only 512 x 9).
+_STRING_LUT_MAX_BITS = 16
+
+
+@functools.lru_cache(maxsize=None)
+def _state_char_luts(size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-bitboard character tables mapping bitboard -> cell bytes."""
+    n = size * size
+    bits = (np.arange(1 << n, dtype=np.uint32)[:, None]
+            >> np.arange(n, dtype=np.uint32)) & 1
+    x_lut = np.where(bits, np.uint8(ord('X')), np.uint8(0))
+    o_lut = np.where(bits, np.uint8(ord('O')), np.uint8(0))
+    return x_lut, o_lut
+
+
+@functools.lru_cache(maxsize=None)
+def _zobrist_table(size: int) -> Tuple[Tuple[int, int], ...]:
+    """Zobrist keys, one (X, O) pair per cell, deterministic per size."""
+    rng = np.random.default_rng(size)
+    keys = rng.integers(0, 2 ** 63, size=(size * size, 2), dtype=np.int64)
+    return tuple((int(x), int(o)) for x, o in keys)
+
+
+@functools.lru_cache(maxsize=None)
+def _d4_permutations(size: int) -> Tuple[Tuple[int, ...], ...]:
+    """Cell-index permutations for the 8 symmetries of the square."""
+    transforms = (
+        lambda r, c: (r, c),
+        lambda r, c: (c, size - 1 - r),
+        lambda r, c: (size - 1 - r, size - 1 - c),
+        lambda r, c: (size - 1 - c, r),
+        lambda r, c: (r, size - 1 - c),
+        lambda r, c: (size - 1 - r, c),
+        lambda r, c: (c, r),
+        lambda r, c: (size - 1 - c, size - 1 - r),
+    )
+    perms = []
+    for transform in transforms:
+        perm = [0] * (size * size)
+        for row in range(size):
+            for col in range(size):
+                new_row, new_col = transform(row, col)
+                perm[row * size + col] = new_row * size + new_col
+        perms.append(tuple(perm))
+    return tuple(perms)
+
+
+@functools.lru_cache(maxsize=None)
+def _move_order(size: int) -> Tuple[int, ...]:
+    """Cell indices ordered center -> corners -> edges.
+
+    Searching strong moves first makes alpha-beta cutoffs much more
+    likely, shrinking the game tree.
+    """
+    center = {(size - 1) // 2, size // 2}
+    corners = {0, size - 1}
+
+    def priority(idx):
+        row, col = divmod(idx, size)
+        if row in center and col in center:
+            return 0
+        if row in corners and col in corners:
+            return 1
+        if row in corners or col in corners:
+            return 2
+        return 3
+
+    return tuple(sorted(range(size * size), key=lambda i: (priority(i), i)))
+
+
+def _transform_bb(bb: int, perm: Tuple[int, ...]) -> int:
+    """Apply a cell-index permutation to a bitboard."""
+    out = 0
+    while bb:
+        m = bb & -bb
+        bb ^= m
+        out |= 1 << perm[m.bit_length() - 1]
+    return out
+
+
+def _canonical(x_bb: int, o_bb: int, size: int) -> Tuple[int, int]:
+    """Canonical (minimal) form of a position under the D4 symmetries."""
+    best = (x_bb, o_bb)
+    for perm in _d4_permutations(size)[1:]:
+        cand = (_transform_bb(x_bb, perm), _transform_bb(o_bb, perm))
+        if cand < best:
+            best = cand
+    return best
+
+
+def _canonical_with_perm(x_bb: int, o_bb: int,
+                         size: int) -> Tuple[Tuple[int, int], Tuple[int, ...]]:
+    """Canonical form plus the cell permutation that produced it."""
+    perms = _d4_permutations(size)
+    best = (x_bb, o_bb)
+    best_perm = perms[0]
+    for perm in perms[1:]:
+        cand = (_transform_bb(x_bb, perm), _transform_bb(o_bb, perm))
+        if cand < best:
+            best = cand
+            best_perm = perm
+    return best, best_perm
+
+
+@functools.lru_cache(maxsize=None)
+def _win_masks(size: int) -> Tuple[int, ...]:
+    """Bitmasks for every winning line (rows, columns, both diagonals)."""
+    masks = []
+    for row in range(size):
+        masks.append(sum(1 << (row * size + col) for col in range(size)))
+    for col in range(size):
+        masks.append(sum(1 << (row * size + col) for row in range(size)))
+    masks.append(sum(1 << (i * size + i) for i in range(size)))
+    masks.append(sum(1 << (i * size + size - 1 - i) for i in range(size)))
+    return tuple(masks)
+
+
+def _immediate_threats(x_bb: int, o_bb: int, size: int) -> int:
+    """Bitmask of cells where X completes a winning line immediately.
+
+    A line one cell short for X with no O blockers makes its missing
+    cell a winning move; swap the arguments to find O's threats.
+    """
+    threats = 0
+    for mask in _win_masks(size):
+        if o_bb & mask:
+            continue
+        missing = mask & ~x_bb
+        if missing and missing & (missing - 1) == 0:
+            threats |= missing
+    return threats
 
 
 class Board:
-    """Represents a noughts-and-crosses board."""
-    
+    """Represents a noughts-and-crosses board.
+
+    The board is stored as two integer bitmasks (`x_bb` for X, `o_bb` for O)
+    with one bit per cell in row-major order, so cell (row, col) maps to bit
+    `row * size + col`. This keeps every move/lookup a handful of C-level
+    integer operations, which matters in the minimax hot path.
+    """
+
     def __init__(self, size: int = 3):
         self.size = size
-        self.board = np.full((size, size), '', dtype=str)
-        self.current_player = 'X'
+        self.x_bb = 0
+        self.o_bb = 0
+        self.hash = 0
+        self._side = 0
         self.move_history = []
-        
+
+    @classmethod
+    def from_bitboards(cls, size: int, x_bb: int, o_bb: int,
+                       side: int = 0) -> 'Board':
+        """Build a board directly from packed bitmasks."""
+        board = cls(size)
+        board.x_bb = x_bb
+        board.o_bb = o_bb
+        board._side = side
+        zobrist = _zobrist_table(size)
+        h = 0
+        for player, bb in enumerate((x_bb, o_bb)):
+            while bb:
+                m = bb & -bb
+                bb ^= m
+                h ^= zobrist[m.bit_length() - 1][player]
+        board.hash = h
+        return board
+
+    @property
+    def current_player(self) -> str:
+        """Symbol of the side to move ('X' or 'O')."""
+        return _PLAYERS[self._side]
+
+    @current_player.setter
+    def current_player(self, value: str):
+        self._side = 0 if value == 'X' else 1
+
+    @property
+    def occ(self) -> int:
+        """Bitmask of all occupied cells."""
+        return self.x_bb | self.o_bb
+
+    @property
+    def full_mask(self) -> int:
+        """Bitmask with every cell set."""
+        return (1 << self.size * self.size) - 1
+
     def get_cell(self, row: int, col: int) -> str:
         """Get the value at a specific cell."""
-        return self.board[row, col]
-    
+        bit = 1 << (row * self.size + col)
+        if self.x_bb & bit:
+            return 'X'
+        if self.o_bb & bit:
+            return 'O'
+        return ''
+
     def set_cell(self, row: int, col: int, value: str):
-        """Set the value at a specific cell."""
-        self.board[row, col] = value
-        
+        """Set the value at a specific cell ('' clears it)."""
+        idx = row * self.size + col
+        bit = 1 << idx
+        keys = _zobrist_table(self.size)[idx]
+        if self.x_bb & bit:
+            self.x_bb &= ~bit
+            self.hash ^= keys[0]
+        elif self.o_bb & bit:
+            self.o_bb &= ~bit
+            self.hash ^= keys[1]
+        if value == 'X':
+            self.x_bb |= bit
+            self.hash ^= keys[0]
+        elif value == 'O':
+            self.o_bb |= bit
+            self.hash ^= keys[1]
+
     def is_valid_move(self, row: int, col: int) -> bool:
         """Check if a move is valid."""
-        return (0 <= row < self.size and 
-                0 <= col < self.size and 
-                self.board[row, col] == '')
-    
-    def make_move(self, row: int, col: int, player: str):
-        """Make a move on the board."""
+        return (0 <= row < self.size and
+                0 <= col < self.size and
+                not (self.occ >> (row * self.size + col)) & 1)
+
+    def make_move(self, row: int, col: int, player: Union[str, int]):
+        """Make a move on the board.
+
+        `player` may be a symbol ('X'/'O') or a side number (0/1).
+        """
         if self.is_valid_move(row, col):
-            self.board[row, col] = player
-            self.move_history.append((row, col, player))
-            self.current_player = 'O' if player == 'X' else 'X'
+            side = 0 if player == 'X' or player == 0 else 1
+            idx = row * self.size + col
+            bit = 1 << idx
+            if side == 0:
+                self.x_bb |= bit
+            else:
+                self.o_bb |= bit
+            self.hash ^= _zobrist_table(self.size)[idx][side]
+            self.move_history.append((row, col, _PLAYERS[side]))
+            self._side = side ^ 1
             return True
         return False
-    
+
     def get_available_moves(self) -> List[Tuple[int, int]]:
         """Get all available moves."""
+        size = self.size
         moves = []
-        for row in range(self.size):
-            for col in range(self.size):
-                if self.board[row, col] == '':
-                    moves.append((row, col))
+        empty = ~self.occ & self.full_mask
+        while empty:
+            m = empty & -empty
+            idx = m.bit_length() - 1
+            moves.append((idx // size, idx % size))
+            empty ^= m
         return moves
-    
+
+    def available_moves_array(self) -> np.ndarray:
+        """Available moves as an (n, 2) int64 array of (row, col) pairs.
+
+        Allocation-light alternative to get_available_moves for numeric
+        consumers: one vectorized pass instead of per-move tuple boxing.
+        """
+        idx = _cell_indices(self.size)
+        empty_bb = np.uint64(~self.occ & self.full_mask)
+        cells = np.flatnonzero((empty_bb >> idx) & np.uint64(1))
+        return np.stack((cells // self.size, cells % self.size), axis=1)
+
     def is_full(self) -> bool:
         """Check if the board is full."""
-        return len(self.get_available_moves()) == 0
-    
+        return self.occ == self.full_mask
+
     def get_winner(self) -> Optional[str]:
         """Get the winner of the game, if any."""
-        # Check rows
-        for row in range(self.size):
-            if all(self.board[row, col] == self.board[row, 0] != '' 
-                   for col in range(self.size)):
-                return self.board[row, 0]
-        
-        # Check columns
-        for col in range(self.size):
-            if all(self.board[row, col] == self.board[0, col] != '' 
-                   for row in range(self.size)):
-                return self.board[0, col]
-        
-        # Check diagonals
-        if all(self.board[i, i] == self.board[0, 0] != '' 
-               for i in range(self.size)):
-            return self.board[0, 0]
-        
-        if all(self.board[i, self.size - 1 - i] == self.board[0, self.size - 1] != '' 
-               for i in range(self.size)):
-            return self.board[0, self.size - 1]
-        
+        if self.occ == 0:
+            return None
+        x_bb = self.x_bb
+        o_bb = self.o_bb
+        for mask in _win_masks(self.size):
+            if x_bb & mask == mask:
+                return 'X'
+            if o_bb & mask == mask:
+                return 'O'
         return None
-    
+
+    def status(self) -> Tuple[bool, Optional[str]]:
+        """Game-over flag and winner from a single line scan.
+
+        Callers that need both answers (game loops) avoid paying for
+        the win check twice per ply.
+        """
+        x_bb = self.x_bb
+        o_bb = self.o_bb
+        for mask in _win_masks(self.size):
+            if x_bb & mask == mask:
+                return True, 'X'
+            if o_bb & mask == mask:
+                return True, 'O'
+        return (x_bb | o_bb) == self.full_mask, None
+
     def is_game_over(self) -> bool:
         """Check if the game is over."""
-        return self.get_winner() is not None or self.is_full()
-    
+        occ = self.occ
+        if occ == self.full_mask:
+            return True
+        x_bb = self.x_bb
+        o_bb = self.o_bb
+        for mask in _win_masks(self.size):
+            if x_bb & mask == mask or o_bb & mask == mask:
+                return True
+        return False
+
     def get_state_vector(self) -> np.ndarray:
         """Convert board state to a vector representation."""
-        # Convert board to numerical representation
-        # X = 1, O = -1, Empty = 0
-        state = np.zeros((self.size, self.size))
-        for row in range(self.size):
-            for col in range(self.size):
-                if self.board[row, col] == 'X':
-                    state[row, col] = 1
-                elif self.board[row, col] == 'O':
-                    state[row, col] = -1
-        return state.flatten()
-    
+        # X = 1, O = -1, Empty = 0. Extract all bits of both bitboards in
+        # one branch-free vectorized pass (boards up to 8x8 fit in uint64).
+        idx = _cell_indices(self.size)
+        x_bits = (np.uint64(self.x_bb) >> idx) & np.uint64(1)
+        o_bits = (np.uint64(self.o_bb) >> idx) & np.uint64(1)
+        return x_bits.astype(np.float64) - o_bits.astype(np.float64)
+
+    def fill_state_vector(self, out: np.ndarray) -> np.ndarray:
+        """Populate a preallocated vector with the board state, in place.
+
+        Same encoding as get_state_vector but without allocating, so hot
+        paths can reuse one buffer across calls.
+        """
+        idx = _cell_indices(self.size)
+        x_bits = (np.uint64(self.x_bb) >> idx) & np.uint64(1)
+        o_bits = (np.uint64(self.o_bb) >> idx) & np.uint64(1)
+        np.copyto(out, x_bits, casting='unsafe')
+        np.subtract(out, o_bits, out=out, casting='unsafe')
+        return out
+
+    def get_state_bytes(self) -> bytes:
+        """Convert board state to ASCII bytes (b'X', b'O', b'.').
+
+        Same layout as get_state_string but without the str decode, so
+        numeric consumers can go straight to np.frombuffer.
+        """
+        n = self.size * self.size
+        if n <= _STRING_LUT_MAX_BITS:
+            # Two table lookups + an OR; empty cells (0) become '.'
+            # via maximum since '.' < 'O' < 'X' in ASCII.
+            x_lut, o_lut = _state_char_luts(self.size)
+            return np.maximum(x_lut[self.x_bb] | o_lut[self.o_bb],
+                              np.uint8(ord('.'))).tobytes()
+        state = bytearray(b'.' * n)
+        for i in range(n):
+            if (self.x_bb >> i) & 1:
+                state[i] = ord('X')
+            elif (self.o_bb >> i) & 1:
+                state[i] = ord('O')
+        return bytes(state)
+
     def get_state_string(self) -> str:
         """Convert board state to a string representation."""
-        state = []
-        for row in range(self.size):
-            for col in range(self.size):
-                cell = self.board[row, col]
-                if cell == '':
-                    state.append('.')
-                else:
-                    state.append(cell)
-        return ''.join(state)
-    
+        return self.get_state_bytes().decode('ascii')
+
     def copy(self) -> 'Board':
         """Create a copy of the board."""
         new_board = Board(self.size)
-        new_board.board = self.board.copy()
-        new_board.current_player = self.current_player
+        new_board.x_bb = self.x_bb
+        new_board.o_bb = self.o_bb
+        new_board.hash = self.hash
+        new_board._side = self._side
         new_board.move_history = self.move_history.copy()
         return new_board
-    
+
     def reset(self):
         """Reset the board to initial state."""
-        self.board = np.full((self.size, self.size), '', dtype=str)
-        self.current_player = 'X'
+        self.x_bb = 0
+        self.o_bb = 0
+        self.hash = 0
+        self._side = 0
         self.move_history = []
-    
+
     def __str__(self) -> str:
         """String representation of the board."""
         result = []
         for row in range(self.size):
             row_str = []
             for col in range(self.size):
-                cell = self.board[row, col]
-                if cell == '':
-                    row_str.append('.')
-                else:
-                    row_str.append(cell)
+                cell = self.get_cell(row, col)
+                row_str.append(cell if cell else '.')
             result.append(' '.join(row_str))
-        return '\n'.join(result) 
\ No newline at end of file
+        return '\n'.join(result)
@@ -1,18 +1,79 @@
 """Bot testing module for Vector-OX."""
 
-import random
+import os
+import zlib
 import click
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from rich.console import Console
-from rich.progress import track
+from rich.progress import Progress
 from rich.table import Table
 from rich.panel import Panel
 from rich.text import Text
 from typing import Dict, List, Tuple
-import statistics
+import numpy as np
 
 from .board import Board
 from .bots import RandomBot, AlgorithmBot, VectorBot
 
+# Per-worker bot instances, built lazily so each process gets its own
+# state (and its own Chroma client for VectorBot).
+_WORKER_BOTS: Dict[str, object] = {}
+
+# One reusable board per size per worker; reset() is O(1) on bitboards,
+# so consecutive games share the allocation.
+_WORKER_BOARDS: Dict[int, Board] = {}
+
+
+def _get_worker_bot(bot_name: str):
+    """Get (or lazily create) this worker's instance of a bot."""
+    bot = _WORKER_BOTS.get(bot_name)
+    if bot is None:
+        bot_class = {'random': RandomBot, 'algorithm': AlgorithmBot,
+                     'vector': VectorBot}[bot_name]
+        bot = _WORKER_BOTS[bot_name] = bot_class()
+    return bot
+
+
+def _play_game_task(bot1_name: str, bot2_name: str,
+                    board_size: int, seed: int) -> str:
+    """Play a single game in a worker process.
+
+    Returns the winning bot's name, or 'tie'. Games are independent, so
+    matchups can be fanned out across processes.
+    """
+    bot1 = _get_worker_bot(bot1_name)
+    bot2 = _get_worker_bot(bot2_name)
+    # Seed the bots' own generators — they each hold a private Random
+    # (VectorBot via its fallback), so the module-level random is never
+    # consulted and seeding it would make no game reproducible.
+    for slot, bot in enumerate((bot1, bot2)):
+        rng = getattr(bot, '_rng', None)
+        if rng is None:
+            rng = getattr(getattr(bot, '_fallback', None), '_rng', None)
+        if rng is not None:
+            rng.seed(seed + slot)
+    board = _WORKER_BOARDS.get(board_size)
+    if board is None:
+        board = _WORKER_BOARDS[board_size] = Board(board_size)
+    else:
+        board.reset()
+
+    while not board.is_game_over():
+        if board.current_player == 'X':
+            move = bot1.get_move(board)
+            board.make_move(move[0], move[1], 'X')
+        else:
+            move = bot2.get_move(board)
+            board.make_move(move[0], move[1], 'O')
+
+    winner = board.get_winner()
+    if winner == 'X':
+        return bot1_name
+    elif winner == 'O':
+        return bot2_name
+    else:
+        return 'tie'
+
 
 class BotTester:
     """Test bots against each other and track performance."""
@@ -21,10 +82,13 @@ class BotTester:
         self.board_size = board_size
         self.games_per_matchup = games_per_matchup
         self.console = Console()
+        # Bot classes by name; instances are created lazily in the
+        # workers so VectorBot's database client is only built when a
+        # matchup actually involves it.
         self.bots = {
-            'random': RandomBot(),
-            'algorithm': AlgorithmBot(),
-            'vector': VectorBot()
+            'random': RandomBot,
+            'algorithm': AlgorithmBot,
+            'vector': VectorBot
         }
         self.results = {}
         
@@ -47,24 +111,41 @@ class BotTester:
                     matchups.append((bot1, bot2))
         
         self.console.print(f"\n[bold]Running {len(matchups)} matchups...[/bold]")
-        
-        for bot1_name, bot2_name in track(matchups, description="Testing matchups"):
-            self.console.print(f"\n[dim]Testing {bot1_name.title()} vs {bot2_name.title()}...[/dim]")
-            self._test_matchup(bot1_name, bot2_name)
-        
+
+        # Games are independent, so fan them out across all cores. The
+        # current matchup is surfaced via the progress bar's description
+        # rather than interleaved prints, which would force a full Rich
+        # render per matchup.
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor, \
+                Progress(console=self.console) as progress:
+            task = progress.add_task("Tournament", total=len(matchups))
+            for bot1_name, bot2_name in matchups:
+                progress.update(
+                    task,
+                    description=f"{bot1_name.title()} vs {bot2_name.title()}")
+                self._test_matchup(bot1_name, bot2_name, executor)
+                progress.update(task, advance=1)
+
         return self.results
-    
-    def _test_matchup(self, bot1_name: str, bot2_name: str):
+
+    def _test_matchup(self, bot1_name: str, bot2_name: str,
+                      executor: ProcessPoolExecutor):
         """Test a specific matchup between two bots."""
-        bot1 = self.bots[bot1_name]
-        bot2 = self.bots[bot2_name]
-        
         bot1_wins = 0
         bot2_wins = 0
         ties = 0
-        
-        for _ in range(self.games_per_matchup):
-            result = self._play_single_game(bot1, bot2, bot1_name, bot2_name)
+
+        # crc32 rather than hash(): string hashing is randomized per
+        # process, which would hand every run different seeds.
+        matchup_seed = zlib.crc32(f"{bot1_name}|{bot2_name}".encode())
+        futures = [
+            executor.submit(_play_game_task, bot1_name, bot2_name,
+                            self.board_size,
+                            (matchup_seed + 2 * i) & 0xFFFFFFFF)
+            for i in range(self.games_per_matchup)
+        ]
+        for future in as_completed(futures):
+            result = future.result()
             if result == bot1_name:
                 bot1_wins += 1
             elif result == bot2_name:
@@ -72,47 +153,30 @@ class BotTester:
             else:
                 ties += 1
         
-        # Store results
-        matchup_key = f"{bot1_name}_vs_{bot2_name}"
-        self.results[matchup_key] = {
-            'bot1': bot1_name,
-            'bot2': bot2_name,
-            'bot1_wins': bot1_wins,
-            'bot2_wins': bot2_wins,
-            'ties': ties,
-            'total_games': self.games_per_matchup
-        }
-        
-        # Also store reverse matchup for easier analysis
-        reverse_key = f"{bot2_name}_vs_{bot1_name}"
-        self.results[reverse_key] = {
-            'bot1': bot2_name,
-            'bot2': bot1_name,
-            'bot1_wins': bot2_wins,
-            'bot2_wins': bot1_wins,
-            'ties': ties,
-            'total_games': self.games_per_matchup
-        }
-    
-    def _play_single_game(self, bot1, bot2, bot1_name: str, bot2_name: str) -> str:
-        """Play a single game between two bots."""
-        board = Board(self.board_size)
-        
-        while not board.is_game_over():
-            if board.current_player == 'X':
-                move = bot1.get_move(board)
-                board.make_move(move[0], move[1], 'X')
-            else:
-                move = bot2.get_move(board)
-                board.make_move(move[0], move[1], 'O')
-        
-        winner = board.get_winner()
-        if winner == 'X':
-            return bot1_name
-        elif winner == 'O':
-            return bot2_name
+        # Store each unordered pair once, aggregating both orientations
+        # (a-as-X vs b, b-as-X vs a) into the same record. Storing a
+        # mirrored duplicate used to double-count every game in the
+        # stats phase.
+        low, high = sorted((bot1_name, bot2_name))
+        matchup_key = f"{low}_vs_{high}"
+        record = self.results.get(matchup_key)
+        if record is None:
+            record = self.results[matchup_key] = {
+                'bot1': low,
+                'bot2': high,
+                'bot1_wins': 0,
+                'bot2_wins': 0,
+                'ties': 0,
+                'total_games': 0
+            }
+        if bot1_name == low:
+            record['bot1_wins'] += bot1_wins
+            record['bot2_wins'] += bot2_wins
         else:
-            return 'tie'
+            record['bot1_wins'] += bot2_wins
+            record['bot2_wins'] += bot1_wins
+        record['ties'] += ties
+        record['total_games'] += self.games_per_matchup
     
     def calculate_bot_stats(self) -> Dict:
         """Calculate overall statistics for each bot."""
@@ -215,27 +279,27 @@ class BotTester:
         matchup_table.add_column("Ties", justify="right", style="yellow")
         matchup_table.add_column("Win Rate", justify="right", style="bold")
         
+        # Each unordered matchup is stored exactly once
         for matchup_key, result in self.results.items():
-            if result['bot1'] < result['bot2']:  # Only show each matchup once
-                bot1_wins = result['bot1_wins']
-                bot2_wins = result['bot2_wins']
-                ties = result['ties']
-                total = result['total_games']
-                
-                if total > 0:
-                    win_rate = bot1_wins / total
-                    win_rate_str = f"{win_rate:.1%}"
-                else:
-                    win_rate_str = "N/A"
-                
-                matchup_table.add_row(
-                    result['bot1'].title(),
-                    result['bot2'].title(),
-                    str(bot1_wins),
-                    str(bot2_wins),
-                    str(ties),
-                    win_rate_str
-                )
+            bot1_wins = result['bot1_wins']
+            bot2_wins = result['bot2_wins']
+            ties = result['ties']
+            total = result['total_games']
+
+            if total > 0:
+                win_rate = bot1_wins / total
+                win_rate_str = f"{win_rate:.1%}"
+            else:
+                win_rate_str = "N/A"
+
+            matchup_table.add_row(
+                result['bot1'].title(),
+                result['bot2'].title(),
+                str(bot1_wins),
+                str(bot2_wins),
+                str(ties),
+                win_rate_str
+            )
         
         self.console.print(matchup_table)
     
@@ -252,7 +316,9 @@ class BotTester:
         self.console.print(f"📉 Worst Performer: {worst_bot[0].title()} ({worst_bot[1]['win_rate']:.1%} win rate)")
         
         # Calculate average win rates
-        avg_win_rate = statistics.mean(stats['win_rate'] for stats in bot_stats.values())
+        avg_win_rate = float(np.fromiter(
+            (stats['win_rate'] for stats in bot_stats.values()),
+            dtype=np.float64).mean())
         self.console.print(f"📊 Average Win Rate: {avg_win_rate:.1%}")
         
         # Performance insights
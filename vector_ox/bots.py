@@ -1,11 +1,67 @@
 """Bot implementations for Vector-OX game."""
 
+import functools
 import random
+from collections import Counter
 import numpy as np
 from typing import Tuple, List, Optional
-import chromadb
 
-from .board import Board
+from .board import (Board, _canonical, _canonical_with_perm, _move_order,
+                    _win_masks, _zobrist_table)
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+@functools.lru_cache(maxsize=None)
+def _win_masks_array(size: int) -> np.ndarray:
+    """Winning-line masks as an int64 array, for the jitted kernel."""
+    return np.array(_win_masks(size), dtype=np.int64)
+
+
+if njit is not None:
+    # No cache=True here: numba cannot safely cache a self-recursive
+    # dispatcher — the first run compiles and works, but reloading the
+    # cached function in a later process segfaults at the first call.
+    @njit(nogil=True)
+    def _negamax_jit(x_bb, o_bb, side, depth, alpha, beta, win_masks, full):
+        """Jitted negamax with alpha-beta over raw int64 bitboards.
+
+        Runs entirely outside the interpreter; no transposition table
+        (typed dicts cost more than they save at this tree size), the
+        alpha-beta cutoffs plus move ordering at the root keep the tree
+        small.
+        """
+        them = o_bb if side == 0 else x_bb
+        for i in range(win_masks.shape[0]):
+            m = win_masks[i]
+            if them & m == m:
+                return depth - 10
+        occ = x_bb | o_bb
+        if occ == full:
+            return 0
+        best = -1024
+        empty = occ ^ full
+        while empty:
+            m = empty & (-empty)
+            empty ^= m
+            if side == 0:
+                score = -_negamax_jit(x_bb | m, o_bb, 1, depth + 1,
+                                      -beta, -alpha, win_masks, full)
+            else:
+                score = -_negamax_jit(x_bb, o_bb | m, 0, depth + 1,
+                                      -beta, -alpha, win_masks, full)
+            if score > best:
+                best = score
+            if score > alpha:
+                alpha = score
+            if beta <= alpha:
+                break
+        return best
+else:
+    _negamax_jit = None
 
 
 class BaseBot:
@@ -18,80 +74,225 @@ class BaseBot:
 
 class RandomBot(BaseBot):
     """Random bot that makes random valid moves."""
-    
+
+    def __init__(self, seed: Optional[int] = None):
+        # Own generator rather than the module-level one: no contention
+        # on the shared Random lock, and a seed gives reproducible games.
+        self._rng = random.Random(seed)
+
     def get_move(self, board: Board) -> Tuple[int, int]:
         """Get a random valid move."""
         available_moves = board.get_available_moves()
-        return random.choice(available_moves)
+        return self._rng.choice(available_moves)
 
 
 class AlgorithmBot(BaseBot):
-    """Algorithm bot using minimax with alpha-beta pruning."""
-    
+    """Algorithm bot using negamax (minimax) with alpha-beta pruning.
+
+    The search operates directly on the board's integer bitmasks, passing
+    them by value down the recursion instead of mutating a Board object,
+    so each node is a handful of C-level integer ops with no make/undo
+    bookkeeping.
+    """
+
+    # Transposition table flags
+    _EXACT, _LOWER, _UPPER = 0, 1, 2
+    _INF = 1 << 10
+
+    # Perfect-play policy for the solved 3x3 game: canonical position ->
+    # best move index in canonical space. Built lazily on first use and
+    # shared by all instances; ~765 canonical positions.
+    _POLICY = None
+
+    def __init__(self):
+        # Zobrist-keyed transposition table: hash -> (score, flag).
+        # Scores are stored depth-adjusted so entries are reusable at any
+        # depth within one search; the table is cleared per top-level move.
+        self.tt = {}
+        # Decision cache: canonical position -> best move index in
+        # canonical space. Persists across games, so positions that recur
+        # in a tournament cost one dict lookup instead of a search.
+        self._move_cache = {}
+
     def get_move(self, board: Board) -> Tuple[int, int]:
-        """Get the best move using minimax algorithm."""
-        best_score = float('-inf')
+        """Get the best move using negamax search."""
+        size = board.size
+        root_canon, canon_perm = _canonical_with_perm(board.x_bb, board.o_bb,
+                                                      size)
+        cached_idx = None
+        if size == 3:
+            if AlgorithmBot._POLICY is None:
+                AlgorithmBot._POLICY = self._solve_all(size)
+            cached_idx = AlgorithmBot._POLICY.get(root_canon)
+        if cached_idx is None:
+            cached_idx = self._move_cache.get(root_canon)
+        if cached_idx is not None:
+            # The cached move lives in canonical space; map it back
+            # through the inverse of the canonicalizing permutation.
+            idx = canon_perm.index(cached_idx)
+            return idx // size, idx % size
+
+        self.tt.clear()
+        masks = _win_masks(size)
+        zobrist = _zobrist_table(size)
+        full = board.full_mask
+        x_bb, o_bb = board.x_bb, board.o_bb
+        side = 0 if board.current_player == 'X' else 1
+        order = _move_order(size)
+
+        best_score = -self._INF
         best_move = None
-        alpha = float('-inf')
-        beta = float('inf')
-        
-        for move in board.get_available_moves():
-            row, col = move
-            board.make_move(row, col, board.current_player)
-            score = self._minimax(board, 0, False, alpha, beta)
-            board.board[row, col] = ''  # Undo move
-            board.current_player = 'X' if board.current_player == 'O' else 'O'
-            
+        alpha = -self._INF
+        beta = self._INF
+        occ = x_bb | o_bb
+        visited = set()
+        for idx in order:
+            m = 1 << idx
+            if occ & m:
+                continue
+            # Skip root moves whose resulting position is a symmetry
+            # (rotation/reflection) of one already searched.
+            if side == 0:
+                canon = _canonical(x_bb | m, o_bb, size)
+            else:
+                canon = _canonical(x_bb, o_bb | m, size)
+            if canon in visited:
+                continue
+            visited.add(canon)
+            nx_bb, no_bb = (x_bb | m, o_bb) if side == 0 else (x_bb, o_bb | m)
+            if _negamax_jit is not None:
+                score = -_negamax_jit(nx_bb, no_bb, side ^ 1, 1,
+                                      -beta, -alpha,
+                                      _win_masks_array(size), full)
+            else:
+                child_hash = board.hash ^ zobrist[idx][side]
+                score = -self._negamax(nx_bb, no_bb, side ^ 1, 1,
+                                       -beta, -alpha, child_hash,
+                                       masks, zobrist, order, full)
             if score > best_score:
                 best_score = score
-                best_move = move
-            
-            alpha = max(alpha, best_score)
+                best_move = (idx // size, idx % size)
+            if best_score > alpha:
+                alpha = best_score
             if beta <= alpha:
                 break
-        
+
+        if best_move is not None:
+            best_idx = best_move[0] * size + best_move[1]
+            self._move_cache[root_canon] = canon_perm[best_idx]
         return best_move
-    
-    def _minimax(self, board: Board, depth: int, is_maximizing: bool, 
-                  alpha: float, beta: float) -> float:
-        """Minimax algorithm with alpha-beta pruning."""
-        if board.is_game_over():
-            winner = board.get_winner()
-            if winner == board.current_player:
-                return 10 - depth
-            elif winner is not None:
+
+    @classmethod
+    def _solve_all(cls, size: int) -> dict:
+        """Solve every reachable canonical position once.
+
+        Walks the reachable state space and runs the normal search on
+        each canonical representative; the solver instance's decision
+        cache then *is* the policy table.
+        """
+        # Empty-dict sentinel: the solver's own policy lookups fall
+        # through to search instead of recursing into the build.
+        cls._POLICY = {}
+        solver = cls()
+        masks = _win_masks(size)
+        zobrist = _zobrist_table(size)
+        full = (1 << size * size) - 1
+        board = Board(size)
+        seen = set()
+        stack = [(0, 0, 0)]
+        while stack:
+            x_bb, o_bb, side = stack.pop()
+            canon = _canonical(x_bb, o_bb, size)
+            if canon in seen:
+                continue
+            seen.add(canon)
+            if ((x_bb | o_bb) == full
+                    or any(x_bb & m == m or o_bb & m == m for m in masks)):
+                continue
+            board.x_bb, board.o_bb = canon
+            board._side = side
+            board.hash = 0
+            for i, keys in enumerate(zobrist):
+                if (canon[0] >> i) & 1:
+                    board.hash ^= keys[0]
+                elif (canon[1] >> i) & 1:
+                    board.hash ^= keys[1]
+            solver.get_move(board)
+            empty = full & ~(x_bb | o_bb)
+            while empty:
+                m = empty & -empty
+                empty ^= m
+                if side == 0:
+                    stack.append((x_bb | m, o_bb, 1))
+                else:
+                    stack.append((x_bb, o_bb | m, 0))
+        return solver._move_cache
+
+    def _negamax(self, x_bb: int, o_bb: int, side: int, depth: int,
+                 alpha: int, beta: int, h: int, masks: Tuple[int, ...],
+                 zobrist, order: Tuple[int, ...], full: int) -> int:
+        """Negamax with alpha-beta, scored from the side to move."""
+        # The opponent moved last; a completed line of theirs means the
+        # side to move has already lost.
+        them = o_bb if side == 0 else x_bb
+        for mask in masks:
+            if them & mask == mask:
                 return depth - 10
+        occ = x_bb | o_bb
+        if occ == full:
+            return 0
+
+        # Probe the transposition table. Stored scores are depth-adjusted
+        # (win/loss scores shift with distance from the root), so rebase
+        # them against the current depth before use.
+        entry = self.tt.get(h)
+        if entry is not None:
+            score, flag = entry
+            score = score - depth if score > 0 else score + depth if score < 0 else 0
+            if flag == self._EXACT:
+                return score
+            if flag == self._LOWER:
+                alpha = max(alpha, score)
             else:
-                return 0
-        
-        if is_maximizing:
-            max_eval = float('-inf')
-            for move in board.get_available_moves():
-                row, col = move
-                board.make_move(row, col, board.current_player)
-                eval_score = self._minimax(board, depth + 1, False, alpha, beta)
-                board.board[row, col] = ''  # Undo move
-                board.current_player = 'X' if board.current_player == 'O' else 'O'
-                
-                max_eval = max(max_eval, eval_score)
-                alpha = max(alpha, eval_score)
-                if beta <= alpha:
-                    break
-            return max_eval
+                beta = min(beta, score)
+            if beta <= alpha:
+                return score
+
+        alpha_orig = alpha
+        best = -self._INF
+        for idx in order:
+            m = 1 << idx
+            if occ & m:
+                continue
+            child_hash = h ^ zobrist[idx][side]
+            if side == 0:
+                score = -self._negamax(x_bb | m, o_bb, 1, depth + 1,
+                                       -beta, -alpha, child_hash,
+                                       masks, zobrist, order, full)
+            else:
+                score = -self._negamax(x_bb, o_bb | m, 0, depth + 1,
+                                       -beta, -alpha, child_hash,
+                                       masks, zobrist, order, full)
+            if score > best:
+                best = score
+            if score > alpha:
+                alpha = score
+            if beta <= alpha:
+                break
+        self._tt_store(h, best, depth, alpha_orig, beta)
+        return best
+
+    def _tt_store(self, key: int, score: int, depth: int,
+                  alpha: int, beta: int):
+        """Record a search result in the transposition table."""
+        if score <= alpha:
+            flag = self._UPPER
+        elif score >= beta:
+            flag = self._LOWER
         else:
-            min_eval = float('inf')
-            for move in board.get_available_moves():
-                row, col = move
-                board.make_move(row, col, board.current_player)
-                eval_score = self._minimax(board, depth + 1, True, alpha, beta)
-                board.board[row, col] = ''  # Undo move
-                board.current_player = 'X' if board.current_player == 'O' else 'O'
-                
-                min_eval = min(min_eval, eval_score)
-                beta = min(beta, eval_score)
-                if beta <= alpha:
-                    break
-            return min_eval
+            flag = self._EXACT
+        adjusted = score + depth if score > 0 else score - depth if score < 0 else 0
+        self.tt[key] = (adjusted, flag)
 
 
 class VectorBot(BaseBot):
@@ -101,20 +302,36 @@ class VectorBot(BaseBot):
         self.collection_name = collection_name
         self.client = None
         self.collection = None
+        # Embedding buffer reused across get_move calls, sized lazily
+        # from the first board seen.
+        self._emb = None
+        # One fallback bot per instance instead of a fresh RandomBot
+        # (and a fresh Random) on every miss.
+        self._fallback = RandomBot()
         self._initialize_db()
     
     def _initialize_db(self):
         """Initialize the vector database connection."""
         try:
+            # Imported lazily: chromadb pulls in sqlite/onnx and costs
+            # hundreds of ms, which the other bots should never pay.
+            import chromadb
+
             self.client = chromadb.PersistentClient(path="./vector_db")
             
             # Get or create collection
             try:
                 self.collection = self.client.get_collection(self.collection_name)
             except:
+                # Must match VectorBuilder's creation metadata: whoever
+                # creates the collection first fixes its distance space
+                # for good, and every write path normalizes for IP.
                 self.collection = self.client.create_collection(
                     name=self.collection_name,
-                    metadata={"description": "Vector-OX game moves"}
+                    metadata={"hnsw:space": "ip",
+                              "hnsw:construction_ef": 200,
+                              "hnsw:M": 16,
+                              "description": "Vector-OX game moves"}
                 )
         except Exception as e:
             print(f"Warning: Could not initialize vector database: {e}")
@@ -125,55 +342,121 @@ class VectorBot(BaseBot):
         """Get move using vector database similarity search."""
         if self.collection is None:
             # Fallback to random if vector DB is not available
-            return RandomBot().get_move(board)
+            return self._fallback.get_move(board)
         
         try:
-            # Get current board state
-            state_vector = board.get_state_vector()
-            state_string = board.get_state_string()
-            
+            # Fill the reusable embedding buffer in place
+            n = board.size * board.size
+            if self._emb is None or self._emb.size != n:
+                self._emb = np.zeros(n, dtype=np.float32)
+            board.fill_state_vector(self._emb)
+
             # Search for similar states
             results = self.collection.query(
-                query_embeddings=[state_vector.tolist()],
+                query_embeddings=[self._emb.tolist()],
                 n_results=5
             )
-            
+
             if results['documents'] and len(results['documents'][0]) > 0:
                 # Find the best move from similar states
                 best_move = self._find_best_move_from_results(board, results)
                 if best_move:
                     return best_move
-            
+
             # Fallback to random if no good matches found
-            return RandomBot().get_move(board)
-            
+            return self._fallback.get_move(board)
+
         except Exception as e:
             print(f"Warning: Vector search failed: {e}")
-            return RandomBot().get_move(board)
-    
+            return self._fallback.get_move(board)
+
+    def get_moves(self, boards: List[Board]) -> List[Tuple[int, int]]:
+        """Get moves for several boards with a single database query.
+
+        Batching amortizes the per-query client overhead across all the
+        boards instead of paying it once per turn.
+        """
+        if not boards:
+            return []
+        if self.collection is None:
+            return [self._fallback.get_move(board) for board in boards]
+
+        try:
+            embeddings = np.vstack(
+                [board.get_state_vector() for board in boards]
+            ).astype(np.float32)
+            results = self.collection.query(
+                query_embeddings=embeddings.tolist(),
+                n_results=5
+            )
+
+            moves = []
+            for i, board in enumerate(boards):
+                per_board = {
+                    'documents': [results['documents'][i]],
+                    'metadatas': [results['metadatas'][i]],
+                }
+                best_move = self._find_best_move_from_results(board, per_board)
+                moves.append(best_move or self._fallback.get_move(board))
+            return moves
+
+        except Exception as e:
+            print(f"Warning: Vector search failed: {e}")
+            return [self._fallback.get_move(board) for board in boards]
+
+    def batch_query(self, states: List[np.ndarray],
+                    n_results: int = 3) -> List[List[Tuple[int, int]]]:
+        """Similar moves for several state vectors in one database query.
+
+        Returns one list of (row, col) candidates per input state.
+        Callers that accumulate pending lookups (replays, multi-game
+        orchestrators) pay the per-query client overhead once for the
+        whole batch instead of once per state.
+        """
+        if not states or self.collection is None:
+            return [[] for _ in states]
+
+        try:
+            embeddings = np.vstack(states).astype(np.float32)
+            results = self.collection.query(
+                query_embeddings=embeddings.tolist(),
+                n_results=n_results
+            )
+        except Exception as e:
+            print(f"Warning: Vector search failed: {e}")
+            return [[] for _ in states]
+
+        metadatas = results.get('metadatas') or []
+        parsed = [
+            [(md['row'], md['col']) for md in per_state
+             if md and 'row' in md]
+            for per_state in metadatas
+        ]
+        # Pad in case the backend returned fewer rows than queries
+        parsed.extend([] for _ in range(len(states) - len(parsed)))
+        return parsed
+
     def _find_best_move_from_results(self, board: Board, results: dict) -> Optional[Tuple[int, int]]:
         """Find the best move from vector search results."""
-        available_moves = board.get_available_moves()
-        if not available_moves:
+        metadatas = results.get('metadatas')
+        if not metadatas or not metadatas[0]:
             return None
-        
-        # Count moves from similar states
-        move_counts = {}
-        for i, doc in enumerate(results['documents'][0]):
-            if doc and '|' in doc:
-                try:
-                    state_str, move_str = doc.split('|', 1)
-                    row, col = map(int, move_str.split(','))
-                    move = (row, col)
-                    if move in available_moves:
-                        move_counts[move] = move_counts.get(move, 0) + 1
-                except:
-                    continue
-        
+
+        # Count moves as flat cell indices (row * size + col) and check
+        # availability with a bit test against the empty-cell mask: int
+        # keys hash faster than tuples and no move set is materialized.
+        size = board.size
+        empty = ~board.occ & board.full_mask
+        if not empty:
+            return None
+        move_counts = Counter(
+            md['row'] * size + md['col'] for md in metadatas[0]
+            if md and 'row' in md and (empty >> (md['row'] * size + md['col'])) & 1
+        )
         if move_counts:
-            # Return the most common move
-            return max(move_counts.items(), key=lambda x: x[1])[0]
-        
+            idx = move_counts.most_common(1)[0][0]
+            return idx // size, idx % size
+
         return None
     
     def add_game_data(self, state_string: str, move: Tuple[int, int], outcome: str):
@@ -185,15 +468,16 @@ class VectorBot(BaseBot):
             # Create state vector
             state_vector = self._string_to_vector(state_string)
             
-            # Create document
+            # The move travels as structured metadata; the document is
+            # just the state string
             doc_id = f"{state_string}_{move[0]}_{move[1]}"
-            document = f"{state_string}|{move[0]},{move[1]}"
-            
+
             self.collection.add(
-                documents=[document],
+                documents=[state_string],
                 embeddings=[state_vector.tolist()],
                 ids=[doc_id],
-                metadatas=[{"outcome": outcome}]
+                metadatas=[{"outcome": outcome,
+                            "row": move[0], "col": move[1]}]
             )
         except Exception as e:
             print(f"Warning: Could not add data to vector database: {e}")
@@ -202,12 +486,19 @@ class VectorBot(BaseBot):
         """Convert state string to vector representation."""
         size = int(len(state_string) ** 0.5)
         vector = np.zeros(size * size)
-        
+
         for i, char in enumerate(state_string):
             if char == 'X':
                 vector[i] = 1
             elif char == 'O':
                 vector[i] = -1
             # Empty cells remain 0
-        
+
+        # Unit-normalize like the builder's rows: in the collection's
+        # IP space a stored vector's norm scales its inner product, so
+        # an un-normalized row would outrank every builder row. The
+        # empty board stays the zero vector.
+        norm = np.linalg.norm(vector)
+        if norm:
+            vector /= norm
         return vector 
\ No newline at end of file
@@ -1,100 +1,383 @@
 """Data generator for Vector-OX training data."""
 
+import os
 import random
 import click
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from rich.console import Console
 from rich.progress import track
+from typing import Optional
 
-from .board import Board
+from .board import Board, _state_char_luts, _win_masks, _STRING_LUT_MAX_BITS
 from .bots import RandomBot, AlgorithmBot
 
 
+class GameData:
+    """Columnar (struct-of-arrays) store for recorded board states.
+
+    One row per recorded ply, kept as parallel preallocated numpy
+    columns: packed bitboards, flat move indices and small integer
+    codes. A row costs a few dozen bytes instead of a five-key dict,
+    and states only become strings at save time.
+    """
+
+    # Outcome codes by column value
+    OUTCOMES = ('X', 'O', 'tie')
+
+    def __init__(self, capacity: int, board_size: int):
+        self.board_size = board_size
+        self.x_bits = np.empty(capacity, dtype=np.uint64)
+        self.o_bits = np.empty(capacity, dtype=np.uint64)
+        self.move_idx = np.empty(capacity, dtype=np.uint8)
+        self.player = np.empty(capacity, dtype=np.uint8)
+        self.outcome = np.empty(capacity, dtype=np.int8)
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def append(self, x_bb: int, o_bb: int, move_idx: int, side: int):
+        """Record one ply; the outcome column is filled at game end."""
+        i = self.count
+        self.x_bits[i] = x_bb
+        self.o_bits[i] = o_bb
+        self.move_idx[i] = move_idx
+        self.player[i] = side
+        self.count = i + 1
+
+    def extend(self, other: 'GameData'):
+        """Copy another store's rows onto the end of this one."""
+        n = other.count
+        i = self.count
+        j = i + n
+        self.x_bits[i:j] = other.x_bits[:n]
+        self.o_bits[i:j] = other.o_bits[:n]
+        self.move_idx[i:j] = other.move_idx[:n]
+        self.player[i:j] = other.player[:n]
+        self.outcome[i:j] = other.outcome[:n]
+        self.count = j
+
+
+def _play_random_game(size: int, rng: random.Random, data: GameData):
+    """Play one random-vs-random game on raw bitboards, without a Board.
+
+    Stand-in for a compiled inner loop: each ply is a handful of int
+    ops plus one rng call, with no object construction, method dispatch
+    or move-list building.
+    """
+    cells = size * size
+    full = (1 << cells) - 1
+    masks = _win_masks(size)
+    append = data.append
+    start = data.count
+    x = o = 0
+    code = 2
+    for ply in range(cells):
+        # Pick the k-th set bit of the empty mask uniformly at random
+        b = full & ~(x | o)
+        for _ in range(rng.randrange(b.bit_count())):
+            b &= b - 1
+        m = b & -b
+        append(x, o, m.bit_length() - 1, ply & 1)
+        if ply & 1 == 0:
+            x |= m
+            mover = x
+        else:
+            o |= m
+            mover = o
+        won = False
+        for wm in masks:
+            if mover & wm == wm:
+                won = True
+                break
+        if won:
+            code = ply & 1
+            break
+    data.outcome[start:data.count] = code
+
+
+# Per-worker generator instance, built lazily so each process keeps its
+# own bots (and their caches) across chunks.
+_WORKER_GENERATOR: Optional['DataGenerator'] = None
+
+
+def _play_chunk(board_size: int, chunk_size: int, seed: int) -> GameData:
+    """Play a chunk of games in a worker process and return its rows."""
+    global _WORKER_GENERATOR
+    generator = _WORKER_GENERATOR
+    if generator is None or generator.board_size != board_size:
+        generator = _WORKER_GENERATOR = DataGenerator(board_size)
+    # Distinct per-chunk seeds keep workers from replaying each other's
+    # games after the process pool forks.
+    generator.random_bot._rng.seed(seed ^ 0x9E3779B9)
+
+    # One vectorized draw covers the whole chunk's bot lottery
+    choices = np.random.default_rng(seed).integers(
+        0, 2, size=(chunk_size, 2), dtype=np.uint8)
+    bots = (generator.random_bot, generator.algorithm_bot)
+
+    data = GameData(chunk_size * board_size ** 2, board_size)
+    for bot1_id, bot2_id in choices:
+        generator._play_single_game(data, bots[bot1_id], bots[bot2_id])
+    return data
+
+
 class DataGenerator:
     """Generate training data for the vector database."""
-    
+
     def __init__(self, board_size: int = 3):
         self.board_size = board_size
         self.console = Console()
         self.random_bot = RandomBot()
         self.algorithm_bot = AlgorithmBot()
-        
-    def generate_games(self, num_games: int = 1000) -> list:
-        """Generate a specified number of games."""
-        games_data = []
-        
+
+    def generate_games(self, num_games: int = 1000,
+                       workers: Optional[int] = None) -> GameData:
+        """Generate a specified number of games.
+
+        Games are independent, so chunks are fanned out across worker
+        processes; each worker plays its chunk and sends the rows back
+        as a GameData block that the parent splices into one store.
+        """
         self.console.print(f"Generating {num_games} games...")
-        
-        for _ in track(range(num_games), description="Generating games"):
-            game_data = self._play_single_game()
-            games_data.extend(game_data)
-        
-        self.console.print(f"Generated {len(games_data)} board states")
-        return games_data
-    
-    def _play_single_game(self) -> list:
-        """Play a single game and return all board states."""
-        board = Board(self.board_size)
-        game_states = []
-        
-        # Randomly choose bot types for both players
-        bot1_type = random.choice(['random', 'algorithm'])
-        bot2_type = random.choice(['random', 'algorithm'])
-        
-        bot1 = self.random_bot if bot1_type == 'random' else self.algorithm_bot
-        bot2 = self.random_bot if bot2_type == 'random' else self.algorithm_bot
-        
-        while not board.is_game_over():
-            # Record current state
-            state_string = board.get_state_string()
-            current_player = board.current_player
-            
-            # Get move
-            if current_player == 'X':
-                move = bot1.get_move(board)
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+
+        # Upper bound: a game records at most one row per cell
+        data = GameData(num_games * self.board_size ** 2, self.board_size)
+
+        if workers <= 1 or num_games < 2 * workers:
+            # One vectorized draw covers the whole run's bot lottery
+            choices = np.random.default_rng().integers(
+                0, 2, size=(num_games, 2), dtype=np.uint8)
+            bots = (self.random_bot, self.algorithm_bot)
+            for bot1_id, bot2_id in track(choices,
+                                          description="Generating games"):
+                self._play_single_game(data, bots[bot1_id], bots[bot2_id])
+            self.console.print(f"Generated {len(data)} board states")
+            return data
+
+        # A few chunks per worker keeps the pool busy even when chunk
+        # runtimes vary (algorithm-bot games take longer than random).
+        chunk = max(1, num_games // (workers * 4))
+        sizes = [chunk] * (num_games // chunk)
+        if num_games % chunk:
+            sizes.append(num_games % chunk)
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_play_chunk, self.board_size, size,
+                                random.getrandbits(32))
+                for size in sizes
+            ]
+            for future in track(as_completed(futures), total=len(futures),
+                                description="Generating games"):
+                data.extend(future.result())
+
+        self.console.print(f"Generated {len(data)} board states")
+        return data
+
+    def generate_games_batched(self, num_games: int = 1000,
+                               batch: int = 4096) -> GameData:
+        """Generate games, advancing random-vs-random games in bulk.
+
+        Games between two random bots need no per-move search, so whole
+        batches of them are stepped one ply at a time as parallel numpy
+        bitboard arrays; a handful of vectorized ops replaces the
+        per-move Python loop. Games involving the algorithm bot still
+        play out one at a time.
+        """
+        self.console.print(f"Generating {num_games} games...")
+
+        # Same per-player bot lottery as generate_games, drawn up front.
+        rng = np.random.default_rng()
+        choices = rng.integers(0, 2, size=(num_games, 2))
+        scalar = choices.any(axis=1)
+        num_random = num_games - int(np.count_nonzero(scalar))
+
+        data = GameData(num_games * self.board_size ** 2, self.board_size)
+        for start in range(0, num_random, batch):
+            self._play_random_batch(min(batch, num_random - start), rng, data)
+
+        bots = (self.random_bot, self.algorithm_bot)
+        for bot1_id, bot2_id in choices[scalar]:
+            self._play_single_game(data, bots[bot1_id], bots[bot2_id])
+
+        self.console.print(f"Generated {len(data)} board states")
+        return data
+
+    def iter_games(self, num_games: int = 1000):
+        """Yield formatted training rows one game at a time.
+
+        Streaming alternative to generate_games for very large runs:
+        only a single game's rows are ever held in memory, so writers
+        can consume the stream with constant footprint.
+        """
+        size = self.board_size
+        data = GameData(size * size, size)
+        outcomes = GameData.OUTCOMES
+        for _ in range(num_games):
+            data.count = 0
+            self._play_single_game(data)
+            n = data.count
+            states = self._decode_states(data.x_bits[:n], data.o_bits[:n])
+            for state, move, code in zip(states, data.move_idx[:n].tolist(),
+                                         data.outcome[:n].tolist()):
+                yield f"{state}|{move // size},{move % size}|{outcomes[code]}\n"
+
+    def _play_random_batch(self, n: int, rng: np.random.Generator,
+                           data: GameData):
+        """Play n random-vs-random games in parallel on numpy bitboards."""
+        size = self.board_size
+        cells = size * size
+        idx = np.arange(cells, dtype=np.uint64)
+        full = np.uint64((1 << cells) - 1)
+        masks = np.array(_win_masks(size), dtype=np.uint64)
+        one = np.uint64(1)
+
+        x = np.zeros(n, dtype=np.uint64)
+        o = np.zeros(n, dtype=np.uint64)
+        # -1 = still running, 0 = X won, 1 = O won, 2 = tie
+        outcome = np.full(n, -1, dtype=np.int8)
+        plies = []
+
+        for ply in range(cells):
+            active = np.flatnonzero(outcome < 0)
+            if active.size == 0:
+                break
+            ax = x[active]
+            ao = o[active]
+
+            # Pick a uniformly random empty cell per game: draw the k-th
+            # set bit of each empty mask via a cumulative popcount.
+            empty = ~(ax | ao) & full
+            bits = ((empty[:, None] >> idx) & one).astype(np.int64)
+            cum = np.cumsum(bits, axis=1)
+            k = rng.integers(0, cum[:, -1])
+            move = np.argmax(cum == (k + 1)[:, None], axis=1)
+            plies.append((active, ax, ao, move))
+
+            side = ply & 1
+            mover = (ax if side == 0 else ao) | (one << move.astype(np.uint64))
+            if side == 0:
+                x[active] = mover
             else:
-                move = bot2.get_move(board)
-            
-            # Record the move
-            game_states.append({
-                'state': state_string,
-                'move': move,
-                'player': current_player,
-                'board_size': self.board_size
-            })
-            
-            # Make the move
-            board.make_move(move[0], move[1], current_player)
-        
-        # Determine outcome
-        winner = board.get_winner()
-        outcome = winner if winner else 'tie'
-        
-        # Add outcome to all states
-        for state in game_states:
-            state['outcome'] = outcome
-        
-        return game_states
-    
-    def save_to_file(self, games_data: list, filename: str = "training_data.txt"):
+                o[active] = mover
+
+            won = ((mover[:, None] & masks) == masks).any(axis=1)
+            filled = (mover | (ao if side == 0 else ax)) == full
+            outcome[active[won]] = side
+            outcome[active[~won & filled]] = 2
+
+        # Flush each ply's rows into the columnar store as array slices
+        for ply, (game_ids, xs, os_, moves) in enumerate(plies):
+            i = data.count
+            j = i + game_ids.size
+            data.x_bits[i:j] = xs
+            data.o_bits[i:j] = os_
+            data.move_idx[i:j] = moves
+            data.player[i:j] = ply & 1
+            data.outcome[i:j] = outcome[game_ids]
+            data.count = j
+
+    def _decode_states(self, x: np.ndarray, o: np.ndarray) -> list:
+        """Decode arrays of X/O bitboards into state strings."""
+        cells = self.board_size * self.board_size
+        if cells <= _STRING_LUT_MAX_BITS:
+            x_lut, o_lut = _state_char_luts(self.board_size)
+            chars = np.maximum(x_lut[x] | o_lut[o], np.uint8(ord('.')))
+            raw = chars.tobytes().decode('ascii')
+            return [raw[i:i + cells] for i in range(0, len(raw), cells)]
+        board = Board(self.board_size)
+        states = []
+        for x_bb, o_bb in zip(x, o):
+            board.x_bb = int(x_bb)
+            board.o_bb = int(o_bb)
+            states.append(board.get_state_string())
+        return states
+
+    def _play_single_game(self, data: GameData, bot1=None, bot2=None):
+        """Play a single game, recording all board states into data."""
+        size = self.board_size
+
+        # Randomly choose bot types for any player not supplied
+        if bot1 is None:
+            bot1_type = random.choice(['random', 'algorithm'])
+            bot1 = self.random_bot if bot1_type == 'random' else self.algorithm_bot
+        if bot2 is None:
+            bot2_type = random.choice(['random', 'algorithm'])
+            bot2 = self.random_bot if bot2_type == 'random' else self.algorithm_bot
+
+        # Two random bots need no Board at all; take the raw-int loop
+        if isinstance(bot1, RandomBot) and isinstance(bot2, RandomBot):
+            _play_random_game(size, bot1._rng, data)
+            return
+
+        board = Board(size)
+        start = data.count
+
+        # Hoist loop invariants into locals so the interpreter resolves
+        # methods and the bot dispatch once, not once per ply
+        status = board.status
+        make_move = board.make_move
+        append = data.append
+        get_move = (bot1.get_move, bot2.get_move)
+        side = 0
+
+        # One status() call per ply answers both "over?" and "who won?"
+        while True:
+            over, winner = status()
+            if over:
+                break
+            row, col = get_move[side](board)
+            append(board.x_bb, board.o_bb, row * size + col, side)
+            make_move(row, col, side)
+            side ^= 1
+
+        # Fill the outcome in for all recorded states
+        code = GameData.OUTCOMES.index(winner if winner else 'tie')
+        data.outcome[start:data.count] = code
+
+    def save_to_file(self, games_data: GameData, filename: str = "training_data.txt"):
         """Save generated data to a file."""
+        size = games_data.board_size
+        n = len(games_data)
+        states = self._decode_states(games_data.x_bits[:n],
+                                     games_data.o_bits[:n])
+        outcomes = GameData.OUTCOMES
+
+        # Format everything up front and write once: one buffer flush
+        # instead of a Python-level write call per line
+        lines = [
+            f"{state}|{move // size},{move % size}|{outcomes[code]}\n"
+            for state, move, code in zip(states,
+                                         games_data.move_idx[:n].tolist(),
+                                         games_data.outcome[:n].tolist())
+        ]
         with open(filename, 'w') as f:
-            for state in games_data:
-                line = f"{state['state']}|{state['move'][0]},{state['move'][1]}|{state['outcome']}\n"
-                f.write(line)
-        
-        self.console.print(f"Saved {len(games_data)} states to {filename}")
+            f.write("".join(lines))
+
+        self.console.print(f"Saved {n} states to {filename}")
 
 
 @click.command()
 @click.option('--board-size', default=3, help='Board size (default: 3)')
 @click.option('--num-games', default=1000, help='Number of games to generate (default: 1000)')
 @click.option('--output-file', default='training_data.txt', help='Output file name (default: training_data.txt)')
-def main(board_size: int, num_games: int, output_file: str):
+@click.option('--stream', is_flag=True, help='Write rows to disk as games finish (constant memory)')
+def main(board_size: int, num_games: int, output_file: str, stream: bool):
     """Generate training data for the vector database."""
     generator = DataGenerator(board_size)
-    games_data = generator.generate_games(num_games)
-    generator.save_to_file(games_data, output_file)
+    if stream:
+        with open(output_file, 'w', buffering=1 << 20) as f:
+            f.writelines(generator.iter_games(num_games))
+        generator.console.print(f"Saved {num_games} games to {output_file}")
+    else:
+        games_data = generator.generate_games(num_games)
+        generator.save_to_file(games_data, output_file)
 
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
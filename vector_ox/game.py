@@ -1,7 +1,11 @@
 """Main game module for Vector-OX."""
 
 import click
+import functools
 import sys
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
 import tty
 import termios
 from rich.console import Console
@@ -15,17 +19,58 @@ from rich.align import Align
 from rich.columns import Columns
 from typing import List, Tuple, Optional
 
-from .board import Board
+from .board import Board, _immediate_threats
 from .bots import RandomBot, AlgorithmBot, VectorBot
 
 
+def _threat_cells(bits: int, board_size: int) -> frozenset:
+    """Expand a threat bitmask into a frozenset of (row, col) cells."""
+    cells = set()
+    while bits:
+        m = bits & -bits
+        bits ^= m
+        idx = m.bit_length() - 1
+        cells.add((idx // board_size, idx % board_size))
+    return frozenset(cells)
+
+
+@functools.lru_cache(maxsize=100_000)
+def _analyze_state(state_string: str, board_size: int,
+                   player: str) -> Tuple[frozenset, frozenset]:
+    """Winning and blocking moves for a position, as frozensets.
+
+    Threats come from a single bitboard line scan per player (a line
+    one cell short with no blockers), and the LRU cache makes repeated
+    positions (openings, history replay) a single dict lookup.
+    """
+    x_bb = o_bb = 0
+    for i, char in enumerate(state_string):
+        if char == 'X':
+            x_bb |= 1 << i
+        elif char == 'O':
+            o_bb |= 1 << i
+
+    mine, theirs = (x_bb, o_bb) if player == 'X' else (o_bb, x_bb)
+    winning = _immediate_threats(mine, theirs, board_size)
+    blocking = _immediate_threats(theirs, mine, board_size)
+    return (_threat_cells(winning, board_size),
+            _threat_cells(blocking, board_size))
+
+
+@dataclass(slots=True, frozen=True)
 class GameState:
-    """Represents a game state with thinking information."""
-    
-    def __init__(self, board: Board, thinking: str = "", move: Optional[Tuple[int, int]] = None):
-        self.board = board.copy()
-        self.thinking = thinking
-        self.move = move
+    """Immutable snapshot of a game state with thinking information.
+
+    Holds just the packed bitmasks and side to move — a few ints per
+    history entry instead of a full Board copy; boards are rebuilt from
+    the masks on navigation.
+    """
+
+    x_bb: int
+    o_bb: int
+    side: int
+    thinking: str = ""
+    move: Optional[Tuple[int, int]] = None
 
 
 class Game:
@@ -43,44 +88,89 @@ class Game:
         self.game_history: List[GameState] = []
         self.current_state_index = -1
         self.thinking_display = ""
+        self.status_display = ""
+
+        # Rendered board panels keyed by position, so replaying history
+        # with [ and ] reuses panels instead of rebuilding them; bounded
+        # LRU-style via OrderedDict
+        self._panel_cache: OrderedDict = OrderedDict()
+
+        # Strategic cell sets, fixed per board size, so explanations do
+        # O(1) membership tests instead of rebuilding lists per move
+        n = board_size
+        self._center = (n // 2, n // 2)
+        self._corners = frozenset(
+            [(0, 0), (0, n - 1), (n - 1, 0), (n - 1, n - 1)])
+        self._edges = frozenset(
+            (i, j) for i in range(n) for j in range(n)
+            if (i in (0, n - 1) or j in (0, n - 1))
+            and (i, j) not in self._corners)
     
-    def get_keypress(self) -> str:
-        """Get a single keypress without requiring Enter."""
+    @contextmanager
+    def _raw_mode(self):
+        """Put the terminal in cbreak mode for the duration of the block.
+
+        Entering cbreak once per game instead of per keypress saves
+        three termios syscalls on every key read. cbreak rather than
+        raw: it still gives unbuffered, echo-free single-key reads but
+        keeps OPOST (so the Live renderer's newlines stay CRLF instead
+        of stair-stepping the layout) and ISIG (so Ctrl-C still raises
+        KeyboardInterrupt).
+        """
         fd = sys.stdin.fileno()
         old_settings = termios.tcgetattr(fd)
         try:
-            tty.setraw(sys.stdin.fileno())
-            ch = sys.stdin.read(1)
-            return ch
+            tty.setcbreak(fd)
+            yield
         finally:
             termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
-        
+
+    def get_keypress(self) -> str:
+        """Get a single keypress without requiring Enter.
+
+        Assumes the terminal is already in cbreak mode (see _raw_mode).
+        """
+        return sys.stdin.read(1)
+
     def create_layout(self) -> Layout:
         """Create the game layout with thinking panel."""
         layout = Layout()
         
-        # Add top margin for input space
+        # Header at the top, status/input line at the bottom
         layout.split_column(
-            Layout(name="margin", size=3),  # Fixed 3-line margin at top
-            Layout(name="game_area")
+            Layout(name="header", size=3),
+            Layout(name="game_area"),
+            Layout(name="status", size=3)
         )
-        
+
         # Split game area into main area and thinking panel
         layout["game_area"].split_column(
             Layout(name="main", ratio=5),
             Layout(name="thinking", ratio=1)
         )
-        
+
         # Split main area into board and controls
         layout["main"].split_row(
             Layout(name="board", ratio=4),  # Increased board ratio
             Layout(name="controls", ratio=2)
         )
-        
+
+        # Controls column split once here rather than per frame
+        layout["controls"].split_column(
+            Layout(name="control_panel"),
+            Layout(name="game_info")
+        )
+
         return layout
     
     def display_board(self) -> Panel:
         """Display the current board state."""
+        key = (self.board.x_bb, self.board.o_bb)
+        panel = self._panel_cache.get(key)
+        if panel is not None:
+            self._panel_cache.move_to_end(key)
+            return panel
+
         table = Table(show_header=False, show_edge=True, box=None, padding=(1, 2))  # Increased padding
         
         # Add columns with increased width
@@ -106,12 +196,16 @@ class Game:
             table.add_row(*row_data)
         
         # Add padding around the board with a title
-        return Panel(
+        panel = Panel(
             Align.center(table),  # Center the table in the panel
             title="Board",
             border_style="blue",
             padding=(1, 1)  # Add padding inside the panel
         )
+        self._panel_cache[key] = panel
+        if len(self._panel_cache) > 64:
+            self._panel_cache.popitem(last=False)
+        return panel
     
     def display_thinking_panel(self) -> Panel:
         """Display the thinking panel."""
@@ -176,24 +270,18 @@ class Game:
                 info.append("[bold yellow]Tie![/bold yellow]")
         
         return Panel("\n".join(info), title="Game Info", border_style="cyan")
-    
 
-    
+    def display_status(self) -> Panel:
+        """Display the status/input line."""
+        return Panel(self.status_display or "", border_style="magenta")
+
     def update_display(self, layout: Layout):
         """Update the game display."""
-        # Update board
         layout["board"].update(self.display_board())
-        
-        # Update thinking panel
         layout["thinking"].update(self.display_thinking_panel())
-        
-        # Update controls
-        controls_layout = Layout()
-        controls_layout.split_column(
-            Layout(self.display_controls()),
-            Layout(self.display_game_info())
-        )
-        layout["controls"].update(controls_layout)
+        layout["control_panel"].update(self.display_controls())
+        layout["game_info"].update(self.display_game_info())
+        layout["status"].update(self.display_status())
     
     def get_player_move(self) -> tuple[int, int]:
         """Get move from human player."""
@@ -264,16 +352,18 @@ class Game:
     
     def add_to_history(self, thinking: str = "", move: Optional[Tuple[int, int]] = None):
         """Add current state to history."""
-        state = GameState(self.board, thinking, move)
+        state = GameState(self.board.x_bb, self.board.o_bb,
+                          self.board._side, thinking, move)
         self.game_history.append(state)
         self.current_state_index = len(self.game_history) - 1
-    
+
     def navigate_to_state(self, index: int):
         """Navigate to a specific game state."""
         if 0 <= index < len(self.game_history):
             self.current_state_index = index
             state = self.game_history[index]
-            self.board = state.board.copy()
+            self.board = Board.from_bitboards(self.board_size, state.x_bb,
+                                              state.o_bb, state.side)
             self.thinking_display = state.thinking
     
     def handle_navigation(self, key: str) -> bool:
@@ -300,125 +390,129 @@ class Game:
         self.game_history = []
         self.current_state_index = -1
         self.thinking_display = ""
+        self.status_display = ""
     
     def play_game(self, player_symbol: str = 'X', bot_type: str = 'random'):
         """Play a complete game with enhanced interface."""
         bot = self.bots[bot_type]
         bot_symbol = 'O' if player_symbol == 'X' else 'X'
-        
-        # Initialize layout
+        review_hint = ("[dim]Press [ or ] to review moves, 'r' to play again, "
+                       "or 'q' to quit[/dim]")
+
+        # The layout tree is built once; each frame only swaps panel
+        # contents and asks Live to repaint, instead of clearing the
+        # screen and re-printing the whole tree.
         layout = self.create_layout()
-        
-        # Print initial game info
-        self.console.clear()
-        self.console.print("\n")  # Add extra line at top
-        self.console.print(Panel(
-            "[bold green]Playing against " + bot_type.title() + " Bot[/bold green]\n" +
-            "Use [ and ] to navigate, '>' to fast-forward, 'r' to reset, 'q' to quit",
+        layout["header"].update(Panel(
+            "[bold green]Playing against " + bot_type.title() + " Bot[/bold green] — "
+            "use [ and ] to navigate, '>' to fast-forward, 'r' to reset, 'q' to quit",
             border_style="green"
         ))
-        
-        while True:  # Main app loop
-            # Clear screen and update display
-            self.console.clear()
-            self.console.print("\n")  # Add extra line at top
+
+        def refresh():
             self.update_display(layout)
-            self.console.print(layout)
-            
-            # Show game result if game is over
-            if self.board.is_game_over():
-                winner = self.board.get_winner()
-                if winner:
-                    if winner == player_symbol:
-                        self.console.print(f"\n[bold green]You win! 🎉[/bold green] [dim]Press [ or ] to review moves, 'r' to play again, or 'q' to quit[/dim]")
+            live.refresh()
+
+        with self._raw_mode(), \
+                Live(layout, console=self.console, screen=True,
+                     auto_refresh=False) as live:
+            while True:  # Main app loop
+                refresh()
+
+                # Show game result if game is over
+                if self.board.is_game_over():
+                    winner = self.board.get_winner()
+                    if winner:
+                        if winner == player_symbol:
+                            self.status_display = f"[bold green]You win! 🎉[/bold green] {review_hint}"
+                        else:
+                            self.status_display = f"[bold red]{bot_type.title()} Bot wins! 🤖[/bold red] {review_hint}"
                     else:
-                        self.console.print(f"\n[bold red]{bot_type.title()} Bot wins! 🤖[/bold red] [dim]Press [ or ] to review moves, 'r' to play again, or 'q' to quit[/dim]")
-                else:
-                    self.console.print(f"\n[bold yellow]It's a tie! 🤝[/bold yellow] [dim]Press [ or ] to review moves, 'r' to play again, or 'q' to quit[/dim]")
-                while True:
-                    try:
-                        key = self.get_keypress()
-                        if key in ['[', ']', '>', 'r', 'q']:
-                            result = self.handle_navigation(key)
-                            if result == "quit":
-                                return
-                            elif result:
-                                break  # Break inner loop to refresh display
-                            elif key == 'r':  # Start new game
-                                break  # Break inner loop to start new game
-                    except KeyboardInterrupt:
-                        return
-                continue  # Continue main loop to refresh display
-            
-            if self.board.current_player == player_symbol:
-                # Human turn
-                self.console.print(f"\n[bold red]Your turn ({player_symbol})[/bold red]")
-                
-                # Get player move with immediate keypress input
-                move_input = ""
-                while True:
-                    try:
-                        # Get single keypress
-                        key = self.get_keypress()
-                        
-                        # Handle navigation commands
-                        if key in ['[', ']', '>', 'r', 'q']:
-                            result = self.handle_navigation(key)
-                            if result == "quit":
-                                return
-                            elif result:
-                                self.update_display(layout)
-                                self.console.print("\n")  # Add extra line at top
-                                self.console.print(layout)
+                        self.status_display = f"[bold yellow]It's a tie! 🤝[/bold yellow] {review_hint}"
+                    refresh()
+                    while True:
+                        try:
+                            key = self.get_keypress()
+                            if key in ['[', ']', '>', 'r', 'q']:
+                                result = self.handle_navigation(key)
+                                if result == "quit":
+                                    return
+                                elif result:
+                                    break  # Break inner loop to refresh display
+                        except KeyboardInterrupt:
+                            return
+                    continue  # Continue main loop to refresh display
+
+                if self.board.current_player == player_symbol:
+                    # Human turn; keypresses echo into the status panel
+                    prompt = f"[bold red]Your turn ({player_symbol})[/bold red]"
+                    self.status_display = prompt
+                    refresh()
+
+                    move_input = ""
+                    while True:
+                        try:
+                            key = self.get_keypress()
+
+                            # Handle navigation commands
+                            if key in ['[', ']', '>', 'r', 'q']:
+                                result = self.handle_navigation(key)
+                                if result == "quit":
+                                    return
+                                elif result:
+                                    refresh()
+                                    continue
+
+                            # Handle backspace
+                            elif key == '\x7f' or key == '\x08':  # Backspace
+                                if move_input:
+                                    move_input = move_input[:-1]
+                                    self.status_display = f"{prompt} [dim]Move: {move_input}[/dim]"
+                                    refresh()
                                 continue
-                        
-                        # Handle backspace
-                        elif key == '\x7f' or key == '\x08':  # Backspace
-                            if move_input:
-                                move_input = move_input[:-1]
-                                self.console.print(f"\r[dim]Move: {move_input}[/dim]", end="")
-                            continue
-                        
-                        # Handle enter
-                        elif key == '\r' or key == '\n':  # Enter
-                            if move_input:
-                                try:
-                                    row, col = self._parse_move_input(move_input)
-                                    if self.board.is_valid_move(row, col):
-                                        self.board.make_move(row, col, player_symbol)
-                                        self.add_to_history(f"Player moved to ({row+1}, {col+1})", (row, col))
-                                        break
-                                    else:
-                                        self.console.print("\n[red]Invalid move! Position already taken.[/red]")
+
+                            # Handle enter
+                            elif key == '\r' or key == '\n':  # Enter
+                                if move_input:
+                                    try:
+                                        row, col = self._parse_move_input(move_input)
+                                        if self.board.is_valid_move(row, col):
+                                            self.board.make_move(row, col, player_symbol)
+                                            self.add_to_history(f"Player moved to ({row+1}, {col+1})", (row, col))
+                                            self.status_display = ""
+                                            break
+                                        else:
+                                            self.status_display = "[red]Invalid move! Position already taken.[/red]"
+                                            move_input = ""
+                                    except ValueError:
+                                        self.status_display = "[red]Invalid input! Use 1-9 for 3x3 or row,col format.[/red]"
                                         move_input = ""
-                                except ValueError:
-                                    self.console.print("\n[red]Invalid input! Use 1-9 for 3x3 or row,col format.[/red]")
-                                    move_input = ""
-                            continue
-                        
-                        # Add character to input
-                        elif key.isprintable():
-                            move_input += key
-                            self.console.print(f"\r[dim]Move: {move_input}[/dim]", end="")
-                        
-                    except KeyboardInterrupt:
-                        return
-            else:
-                # Bot turn
-                self.console.print(f"\n[bold blue]{bot_type.title()} Bot's turn ({bot_symbol})[/bold blue]")
-                self.thinking_display = "Bot is thinking..."
-                self.update_display(layout)
-                self.console.print("\n")  # Add extra line at top
-                self.console.print(layout)
-                
-                # Get bot's move with explanation
-                move, explanation = self._get_bot_move_with_explanation(bot, bot_type)
-                row, col = move
-                
-                # Update thinking display
-                self.thinking_display = f"🤖 {bot_type.title()} Bot's reasoning:\n{explanation}"
-                self.board.make_move(row, col, bot_symbol)
-                self.add_to_history(self.thinking_display, (row, col))
+                                    refresh()
+                                continue
+
+                            # Add character to input
+                            elif key.isprintable():
+                                move_input += key
+                                self.status_display = f"{prompt} [dim]Move: {move_input}[/dim]"
+                                refresh()
+
+                        except KeyboardInterrupt:
+                            return
+                else:
+                    # Bot turn
+                    self.status_display = f"[bold blue]{bot_type.title()} Bot's turn ({bot_symbol})[/bold blue]"
+                    self.thinking_display = "Bot is thinking..."
+                    refresh()
+
+                    # Get bot's move with explanation
+                    move, explanation = self._get_bot_move_with_explanation(bot, bot_type)
+                    row, col = move
+
+                    # Update thinking display
+                    self.thinking_display = f"🤖 {bot_type.title()} Bot's reasoning:\n{explanation}"
+                    self.board.make_move(row, col, bot_symbol)
+                    self.add_to_history(self.thinking_display, (row, col))
+                    self.status_display = ""
     
     def _get_bot_move_with_explanation(self, bot, bot_type: str) -> tuple[tuple[int, int], str]:
         """Get bot's move with explanation of its reasoning."""
@@ -446,43 +540,26 @@ class Game:
         
         # Analyze the board state to provide explanation
         explanation_parts = []
-        
-        # Check for winning moves
-        for row, col in self.board.get_available_moves():
-            test_board = self.board.copy()
-            test_board.make_move(row, col, self.board.current_player)
-            if test_board.get_winner() == self.board.current_player:
-                if (row, col) == move:
-                    explanation_parts.append("Found winning move!")
-                break
-        
-        # Check for blocking moves
-        opponent = 'O' if self.board.current_player == 'X' else 'X'
-        for row, col in self.board.get_available_moves():
-            test_board = self.board.copy()
-            test_board.make_move(row, col, opponent)
-            if test_board.get_winner() == opponent:
-                if (row, col) == move:
-                    explanation_parts.append("Blocking opponent's winning move")
-                break
+
+        # Check for winning and blocking moves (cached per state)
+        winning_moves, blocking_moves = _analyze_state(
+            self.board.get_state_string(), self.board_size,
+            self.board.current_player)
+        if move in winning_moves:
+            explanation_parts.append("Found winning move!")
+        if move in blocking_moves:
+            explanation_parts.append("Blocking opponent's winning move")
         
         # Check for center move (good strategy)
-        center = self.board_size // 2
-        if move == (center, center) and self.board.get_cell(center, center) == '':
+        if move == self._center and self.board.get_cell(*self._center) == '':
             explanation_parts.append("Taking center position (strong strategic move)")
-        
+
         # Check for corner moves
-        corners = [(0, 0), (0, self.board_size-1), (self.board_size-1, 0), (self.board_size-1, self.board_size-1)]
-        if move in corners and self.board.get_cell(move[0], move[1]) == '':
+        if move in self._corners and self.board.get_cell(move[0], move[1]) == '':
             explanation_parts.append("Taking corner position (good strategic move)")
-        
+
         # Check for edge moves
-        edges = []
-        for i in range(self.board_size):
-            if i != center:
-                edges.extend([(i, 0), (i, self.board_size-1), (0, i), (self.board_size-1, i)])
-        
-        if move in edges and self.board.get_cell(move[0], move[1]) == '':
+        if move in self._edges and self.board.get_cell(move[0], move[1]) == '':
             explanation_parts.append("Taking edge position")
         
         if not explanation_parts:
@@ -509,17 +586,14 @@ class Game:
                     n_results=3
                 )
                 
-                if results['documents'] and len(results['documents'][0]) > 0:
-                    similar_moves = []
-                    for doc in results['documents'][0]:
-                        if doc and '|' in doc:
-                            try:
-                                state_str, move_str = doc.split('|', 1)
-                                row, col = map(int, move_str.split(','))
-                                similar_moves.append((row, col))
-                            except:
-                                continue
-                    
+                if results['metadatas'] and len(results['metadatas'][0]) > 0:
+                    # Moves travel as structured metadata; no string parsing
+                    similar_moves = [
+                        (md['row'], md['col'])
+                        for md in results['metadatas'][0]
+                        if md and 'row' in md
+                    ]
+
                     if similar_moves:
                         move_counts = {}
                         for m in similar_moves:
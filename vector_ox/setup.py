@@ -5,9 +5,6 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
 
-from .data_generator import DataGenerator
-from .vector_builder import VectorBuilder
-
 
 @click.command()
 @click.option('--board-size', default=3, help='Board size (default: 3)')
@@ -27,6 +24,8 @@ def main(board_size: int, num_games: int, skip_data_generation: bool):
     if not skip_data_generation:
         console.print("\n[bold]Step 1: Generating training data...[/bold]")
         try:
+            from .data_generator import DataGenerator
+
             generator = DataGenerator(board_size)
             games_data = generator.generate_games(num_games)
             generator.save_to_file(games_data, "training_data.txt")
@@ -39,6 +38,10 @@ def main(board_size: int, num_games: int, skip_data_generation: bool):
     
     console.print("\n[bold]Step 2: Building vector database...[/bold]")
     try:
+        # Deferred: pulls in chromadb and friends, which dominate CLI
+        # start-up and are pointless for --help
+        from .vector_builder import VectorBuilder
+
         builder = VectorBuilder()
         builder.load_from_file("training_data.txt")
         count = builder.get_collection_info()
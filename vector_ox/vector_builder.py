@@ -1,19 +1,73 @@
 """Vector database builder for Vector-OX."""
 
+import functools
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import click
 import numpy as np
 from rich.console import Console
-from rich.progress import track
+from rich.progress import Progress
 import chromadb
 
 from .bots import VectorBot
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# ASCII codes for the cell symbols
+_X = ord('X')
+_O = ord('O')
+
+
+if njit is not None:
+    @njit(cache=True, nogil=True)
+    def _string_to_vector_nb(buf):
+        # A plain loop beats NumPy's masked arithmetic at these sizes
+        # (9-100 elements), where NumPy's fixed per-op overhead
+        # dominates the actual work.
+        out = np.zeros(buf.size, dtype=np.float32)
+        for i in range(buf.size):
+            c = buf[i]
+            if c == _X:
+                out[i] = 1.0
+            elif c == _O:
+                out[i] = -1.0
+        return out
+
+
+@functools.lru_cache(maxsize=100_000)
+def _encode_state(state_string: str) -> np.ndarray:
+    """Encode one state string as its {-1, 0, 1} float32 vector.
+
+    Board states recur constantly in game logs, so the cache returns
+    the already-built vector for every repeat; a full 3x3 state space
+    is only 19683 entries, well under the cap.
+    """
+    buf = np.frombuffer(state_string.encode('ascii'), dtype=np.uint8)
+    if njit is not None:
+        vec = _string_to_vector_nb(buf)
+    else:
+        vec = (buf == _X).astype(np.float32) - (buf == _O).astype(np.float32)
+    # Unit-normalize to match the collection's IP space (the empty
+    # board stays the zero vector)
+    norm = np.linalg.norm(vec)
+    if norm:
+        vec /= norm
+    return vec
+
 
 class VectorBuilder:
     """Build vector database from training data."""
     
-    def __init__(self, collection_name: str = "vector_ox_moves"):
+    def __init__(self, collection_name: str = "vector_ox_moves",
+                 batch_size: int = 5000):
         self.collection_name = collection_name
+        # Large batches amortize Chroma's per-call validation and
+        # commit overhead; one batch of embeddings is only a few
+        # hundred KB at these dimensions.
+        self.batch_size = batch_size
         self.console = Console()
         self._initialize_db()
     
@@ -27,9 +81,15 @@ class VectorBuilder:
                 self.collection = self.client.get_collection(self.collection_name)
                 self.console.print(f"Using existing collection: {self.collection_name}")
             except:
+                # Inner-product space over pre-normalized vectors: the
+                # distance kernel is one dot product per candidate, with
+                # no subtract/square/sqrt reduction as in L2
                 self.collection = self.client.create_collection(
                     name=self.collection_name,
-                    metadata={"description": "Vector-OX game moves"}
+                    metadata={"hnsw:space": "ip",
+                              "hnsw:construction_ef": 200,
+                              "hnsw:M": 16,
+                              "description": "Vector-OX game moves"}
                 )
                 self.console.print(f"Created new collection: {self.collection_name}")
                 
@@ -37,64 +97,178 @@ class VectorBuilder:
             self.console.print(f"[red]Error initializing vector database: {e}[/red]")
             raise
     
+    def _parse_columns(self, raw: bytes):
+        """Split the whole file into columns in one C-level pass.
+
+        Every line is state|row,col|outcome, so replacing newlines with
+        the field separator turns the file into one flat field list
+        that a single split decomposes; strided slices then recover the
+        columns. Returns (states, rows, cols, outcomes), or None when
+        any line deviates from the regular layout (the caller falls
+        back to per-line parsing).
+        """
+        # Normalize CRLF first, or every outcome field would keep a
+        # trailing \r and silently poison the metadata downstream
+        raw = raw.replace(b'\r\n', b'\n').strip(b'\n')
+        if not raw:
+            return None
+        fields = raw.replace(b'\n', b'|').split(b'|')
+        if len(fields) % 3:
+            return None
+
+        states = fields[0::3]
+        if any(len(state) != len(states[0]) for state in states):
+            return None
+
+        rows = []
+        cols = []
+        try:
+            for move in fields[1::3]:
+                row, col = move.split(b',')
+                rows.append(int(row))
+                cols.append(int(col))
+        except ValueError:
+            return None
+        return states, rows, cols, fields[2::3]
+
     def load_from_file(self, filename: str = "training_data.txt"):
         """Load training data from file and add to vector database."""
         try:
-            with open(filename, 'r') as f:
-                lines = f.readlines()
-            
-            self.console.print(f"Loading {len(lines)} training examples...")
-            
+            # One bytes read: no per-line str decoding up front
+            with open(filename, 'rb') as f:
+                raw = f.read()
+
+            parsed = self._parse_columns(raw)
+            if parsed is not None:
+                # Regular file: columns come straight from the bulk split
+                states, rows, cols, outcomes = parsed
+                self.console.print(f"Loading {len(states)} training examples...")
+            else:
+                # Irregular file: parse line by line, skipping bad rows
+                lines = raw.split(b'\n')
+                self.console.print(f"Loading {len(lines)} training examples...")
+
+                states = []
+                rows = []
+                cols = []
+                outcomes = []
+
+                # Explicit checks instead of a per-line try/except: no
+                # exception-context setup in the hot loop and, crucially,
+                # no console.print per bad line — one summary at the end.
+                # The bar only refreshes every 4096 lines (and not at all
+                # for small files): track() touches the renderer per
+                # iteration, which costs more than the parse itself.
+                skipped = 0
+                with Progress(console=self.console,
+                              disable=len(lines) < 10_000) as progress:
+                    task = progress.add_task("Processing data",
+                                             total=len(lines))
+                    for i, line in enumerate(lines):
+                        if i & 4095 == 4095:
+                            progress.update(task, completed=i + 1)
+
+                        line = line.strip()
+                        if not line:
+                            continue
+
+                        # Parse line: state|move|outcome, all as bytes
+                        parts = line.split(b'|')
+                        if len(parts) < 3:
+                            skipped += 1
+                            continue
+                        state_bytes = parts[0]
+                        move = parts[1].split(b',')
+                        if (len(move) != 2
+                                or not move[0].isdigit()
+                                or not move[1].isdigit()):
+                            skipped += 1
+                            continue
+                        # All states must share one length so they can be
+                        # encoded as a single matrix below
+                        if states and len(state_bytes) != len(states[0]):
+                            skipped += 1
+                            continue
+
+                        states.append(state_bytes)
+                        rows.append(int(move[0]))
+                        cols.append(int(move[1]))
+                        outcomes.append(parts[2])
+                    progress.update(task, completed=len(lines))
+
+                if skipped:
+                    self.console.print(f"[yellow]Warning: Skipped {skipped} malformed lines[/yellow]")
+
+            # Aggregate duplicate (state, move) rows before insert. Game
+            # logs repeat the same positions constantly; one collection
+            # row per unique pair, carrying its tallies, shrinks both
+            # the HNSW build and every later query by the duplication
+            # factor.
+            aggregated = {}
+            for state, row, col, outcome in zip(states, rows, cols, outcomes):
+                key = (state, row, col)
+                counts = aggregated.get(key)
+                if counts is None:
+                    counts = aggregated[key] = {}
+                counts[outcome] = counts.get(outcome, 0) + 1
+
             documents = []
-            embeddings = []
             ids = []
             metadatas = []
-            
-            for i, line in enumerate(track(lines, description="Processing data")):
-                line = line.strip()
-                if not line:
-                    continue
-                
-                try:
-                    # Parse line: state|move|outcome
-                    parts = line.split('|')
-                    if len(parts) >= 3:
-                        state_string = parts[0]
-                        move_str = parts[1]
-                        outcome = parts[2]
-                        
-                        # Parse move
-                        row, col = map(int, move_str.split(','))
-                        
-                        # Create vector representation
-                        state_vector = self._string_to_vector(state_string)
-                        
-                        # Create document
-                        document = f"{state_string}|{row},{col}"
-                        doc_id = f"{state_string}_{row}_{col}_{i}"
-                        
-                        documents.append(document)
-                        embeddings.append(state_vector.tolist())
-                        ids.append(doc_id)
-                        metadatas.append({"outcome": outcome})
-                        
-                except Exception as e:
-                    self.console.print(f"[yellow]Warning: Skipping malformed line {i+1}: {e}[/yellow]")
-                    continue
-            
+            states = []
+            for (state, row, col), counts in aggregated.items():
+                doc = state.decode('ascii')
+                total = sum(counts.values())
+                # The side to move follows from the piece counts
+                mover = 'X' if doc.count('X') == doc.count('O') else 'O'
+                wins = counts.get(mover.encode('ascii'), 0)
+                majority = max(counts, key=counts.get).decode('ascii')
+
+                states.append(state)
+                documents.append(doc)
+                # Unique (and rerun-stable) without a line-number suffix
+                ids.append(f"{doc}_{row}_{col}")
+                metadatas.append({"outcome": majority, "row": row,
+                                  "col": col, "count": total,
+                                  "win_rate": wins / total})
+
             if documents:
-                # Add to collection in batches
-                batch_size = 100
-                for i in range(0, len(documents), batch_size):
-                    batch_end = min(i + batch_size, len(documents))
-                    
-                    self.collection.add(
-                        documents=documents[i:batch_end],
-                        embeddings=embeddings[i:batch_end],
-                        ids=ids[i:batch_end],
-                        metadatas=metadatas[i:batch_end]
-                    )
-                
+                # Encode every state in one vectorized pass: one (N, d)
+                # matrix instead of N small per-line arrays. The values
+                # are ternary {-1, 0, 1}, so int8 holds them exactly at
+                # an eighth of float64's footprint; viewing the boolean
+                # masks as int8 avoids even a cast.
+                buf = np.frombuffer(b''.join(states),
+                                    dtype=np.uint8).reshape(len(states), -1)
+                embeddings = ((buf == _X).view(np.int8)
+                              - (buf == _O).view(np.int8))
+                # Unit-normalize for the collection's IP space, one
+                # vectorized pass over the whole matrix. The empty board
+                # is the zero vector; leave it as-is rather than divide
+                # by zero.
+                embeddings = embeddings.astype(np.float32)
+                norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+                np.divide(embeddings, norms, out=embeddings,
+                          where=norms != 0.0)
+
+                # Upsert batches concurrently: Chroma's HNSW insertion
+                # runs in C++ with the GIL released, so threads overlap
+                # index building with Python-side batch slicing
+                batch_size = self.batch_size
+                with ThreadPoolExecutor(max_workers=4) as pool:
+                    futures = [
+                        pool.submit(
+                            self._add_batch,
+                            documents=documents[i:i + batch_size],
+                            embeddings=embeddings[i:i + batch_size],
+                            ids=ids[i:i + batch_size],
+                            metadatas=metadatas[i:i + batch_size]
+                        )
+                        for i in range(0, len(documents), batch_size)
+                    ]
+                    for future in as_completed(futures):
+                        future.result()
+
                 self.console.print(f"[green]Successfully added {len(documents)} examples to vector database[/green]")
             else:
                 self.console.print("[red]No valid data found in file[/red]")
@@ -104,19 +278,30 @@ class VectorBuilder:
         except Exception as e:
             self.console.print(f"[red]Error loading data: {e}[/red]")
     
+    def _add_batch(self, documents: list, embeddings: np.ndarray,
+                   ids: list, metadatas: list):
+        """Upsert one batch, handing embeddings over as a numpy slice.
+
+        upsert rather than add: it skips add's per-id existence check
+        and, since ids are stable per (state, move), makes rebuilds and
+        crash recovery restart from the last committed batch instead of
+        requiring the collection to be dropped first. Recent Chroma
+        clients take arrays directly, skipping per-float boxing; if this
+        client insists on lists, the slice is converted once per batch
+        rather than once per row.
+        """
+        try:
+            self.collection.upsert(documents=documents,
+                                   embeddings=embeddings,
+                                   ids=ids, metadatas=metadatas)
+        except (TypeError, ValueError):
+            self.collection.upsert(documents=documents,
+                                   embeddings=embeddings.tolist(),
+                                   ids=ids, metadatas=metadatas)
+
     def _string_to_vector(self, state_string: str) -> np.ndarray:
         """Convert state string to vector representation."""
-        size = int(len(state_string) ** 0.5)
-        vector = np.zeros(size * size)
-        
-        for i, char in enumerate(state_string):
-            if char == 'X':
-                vector[i] = 1
-            elif char == 'O':
-                vector[i] = -1
-            # Empty cells remain 0
-        
-        return vector
+        return _encode_state(state_string)
     
     def get_collection_info(self):
         """Get information about the collection."""